@@ -0,0 +1,247 @@
+# chatbot/bulk_runner.py
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from googleapiclient.errors import HttpError
+from groq import APIStatusError
+from chatbot.rag_chatbot import RAGChatbot
+from utils.rate_limiter import TokenBucket, DailyQuota, QuotaExceededError
+from utils.constants import (
+    GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE, GOOGLE_CSE_DAILY_QUOTA,
+    GOOGLE_CSE_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_REQUEST_ESTIMATE, BULK_MAX_WORKERS,
+    GROQ_MAX_RETRIES, GROQ_RETRY_BACKOFF, GROQ_MAX_RETRY_WAIT
+)
+
+class BulkRunner:
+    """
+    Runs many queries through the RAG pipeline without tripping the Groq or Google CSE quotas.
+    Input is JSONL ({"id": ..., "query": ...} per line), output is JSONL with the answer and per-query metrics.
+    The output file doubles as the checkpoint: queries whose id is already in it are skipped on restart.
+    CSE calls made today are counted in `<output>.cse_quota.json`; the run stops once the daily quota is used up.
+    """
+    def __init__(self, chatbot=None, max_workers=BULK_MAX_WORKERS,
+                 groq_rpm=GROQ_REQUESTS_PER_MINUTE, groq_tpm=GROQ_TOKENS_PER_MINUTE,
+                 cse_rpm=GOOGLE_CSE_REQUESTS_PER_MINUTE, cse_daily_quota=GOOGLE_CSE_DAILY_QUOTA):
+        self.chatbot = chatbot or RAGChatbot()
+        self.max_workers = max_workers
+        self.groq_requests = TokenBucket.per_minute(groq_rpm)
+        self.groq_tokens = TokenBucket.per_minute(groq_tpm)
+        self.cse_requests = TokenBucket.per_minute(cse_rpm)
+        self.cse_daily_quota = cse_daily_quota
+        self.cse_quota = None # Hard daily cap, created in run() next to the checkpoint
+        self.output_lock = threading.Lock()
+        self.stopped = threading.Event() # Set once a quota is hit so queued workers do not start
+
+    def _load_queries(self, input_path: str) -> list[dict]:
+        queries = []
+        with open(input_path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                queries.append({"id": str(record.get("id", line_no)), "query": record["query"]})
+        return queries
+
+    def _load_completed_ids(self, output_path: str) -> set[str]:
+        """Reads the ids already answered by a previous (possibly interrupted) run."""
+        completed = set()
+        if not os.path.exists(output_path):
+            return completed
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    completed.add(str(json.loads(line)["id"]))
+                except (json.JSONDecodeError, KeyError):
+                    # A run killed mid-write can leave a truncated last line; that query is simply redone
+                    continue
+        return completed
+
+    def _ends_with_newline(self, path: str) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _process(self, record: dict) -> dict | None:
+        """Answers a single query, or defers it if another worker has already hit a quota."""
+        if self.stopped.is_set():
+            raise QuotaExceededError("Run stopped after a quota was hit.")
+        try:
+            return self._answer(record)
+        except QuotaExceededError:
+            # Cancelling futures from run() can race with idle workers picking up the next query
+            self.stopped.set()
+            raise
+
+    def _answer(self, record: dict) -> dict | None:
+        """Runs the pipeline for one query, waiting on the limiters before each external call."""
+        query = record["query"]
+        start = time.perf_counter()
+
+        # One CSE call per query
+        if not self.cse_quota.try_acquire():
+            raise QuotaExceededError("Google CSE daily quota used up.")
+        self.cse_requests.acquire()
+
+        retrieval_start = time.perf_counter()
+        retriever = self.chatbot.retriever
+        local_results = retriever.retrieve_local(query)
+        try:
+            web_results = retriever.retrieve_web(query, raise_errors=True)
+        except HttpError as e:
+            if e.resp.status == 429:
+                raise QuotaExceededError(f"Google CSE rejected the request: {e}") from e
+            print(f"Query {record['id']} failed during web search; it will be retried on the next run.")
+            return None
+        except Exception:
+            # Answering from local results only would checkpoint a degraded answer that is never redone
+            print(f"Query {record['id']} failed during web search; it will be retried on the next run.")
+            return None
+
+        retrieved_context = retriever.select_context(query, local_results + web_results)
+        retrieval_latency = time.perf_counter() - retrieval_start
+
+        generation_start = time.perf_counter()
+        llm_response = self._generate(record, retrieved_context)
+        generation_latency = time.perf_counter() - generation_start
+        if llm_response is None:
+            # Leave the query out of the checkpoint so a resumed run retries it
+            print(f"Query {record['id']} failed during generation; it will be retried on the next run.")
+            return None
+
+        return {
+            "id": record["id"],
+            "query": query,
+            "answer": self.chatbot.add_disclaimer(llm_response["answer"]),
+            "sources_used": llm_response["sources_used"],
+            "token_usage": llm_response["token_usage"],
+            "latency": time.perf_counter() - start,
+            "retrieval_latency": retrieval_latency,
+            "generation_latency": generation_latency,
+        }
+
+    def _generate(self, record: dict, context: list[dict]) -> dict | None:
+        """
+        Calls Groq for an already retrieved context, retrying rate-limit and transient errors so the
+        CSE call spent on the query is not wasted. Returns None if the query should be retried later;
+        raises QuotaExceededError if Groq keeps rate-limiting, so the run stops instead of burning CSE quota.
+        """
+        for attempt in range(GROQ_MAX_RETRIES + 1):
+            # Reserve an estimate up front, then settle against the usage.total_tokens Groq reports
+            self.groq_requests.acquire()
+            self.groq_tokens.acquire(GROQ_TOKENS_PER_REQUEST_ESTIMATE)
+            try:
+                llm_response = self.chatbot.generator.generate_answer(record["query"], context, raise_errors=True)
+            except APIStatusError as e:
+                self.groq_tokens.adjust(-GROQ_TOKENS_PER_REQUEST_ESTIMATE) # Rejected calls use no tokens
+                if e.status_code != 429 and e.status_code < 500:
+                    return None
+                delay = self._retry_after(e) or GROQ_RETRY_BACKOFF * 2 ** attempt
+                if e.status_code == 429 and (attempt == GROQ_MAX_RETRIES or delay > GROQ_MAX_RETRY_WAIT):
+                    raise QuotaExceededError(f"Groq kept rate-limiting (retry after {delay:.0f}s).") from e
+                if attempt == GROQ_MAX_RETRIES:
+                    return None
+            except Exception:
+                # Connection errors and timeouts
+                self.groq_tokens.adjust(-GROQ_TOKENS_PER_REQUEST_ESTIMATE)
+                if attempt == GROQ_MAX_RETRIES:
+                    return None
+                delay = GROQ_RETRY_BACKOFF * 2 ** attempt
+            else:
+                self.groq_tokens.adjust(llm_response["token_usage"] - GROQ_TOKENS_PER_REQUEST_ESTIMATE)
+                return llm_response
+
+            print(f"Query {record['id']}: Groq call failed, retrying in {delay:.1f}s ({attempt + 1}/{GROQ_MAX_RETRIES}).")
+            time.sleep(delay)
+
+    def _retry_after(self, error: APIStatusError) -> float | None:
+        """Seconds to wait from the Retry-After header of a Groq error response, if present."""
+        try:
+            return float(error.response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def run(self, input_path: str, output_path: str) -> dict:
+        """
+        Processes every query in `input_path` not yet present in `output_path`.
+        Returns a summary dict with counts of completed, skipped, failed and deferred queries
+        (deferred queries were not run because the CSE daily quota ran out or Groq kept rate-limiting).
+        """
+        queries = self._load_queries(input_path)
+        completed_ids = self._load_completed_ids(output_path)
+        pending = [q for q in queries if q["id"] not in completed_ids]
+        print(f"Loaded {len(queries)} queries, {len(queries) - len(pending)} already completed, {len(pending)} to run.")
+
+        self.stopped.clear()
+        self.cse_quota = DailyQuota(self.cse_daily_quota, f"{output_path}.cse_quota.json")
+        print(f"Google CSE quota remaining today: {self.cse_quota.remaining()}/{self.cse_daily_quota}.")
+
+        completed, failed, deferred = 0, 0, 0
+        quota_exceeded = False
+        metrics = self.chatbot.get_metrics()
+        with open(output_path, "a", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if out.tell() > 0 and not self._ends_with_newline(output_path):
+                out.write("\n") # Terminate a truncated line so new records start cleanly
+            futures = {executor.submit(self._process, record): record for record in pending}
+            for future in as_completed(futures):
+                record = futures[future]
+                if future.cancelled():
+                    deferred += 1
+                    continue
+                try:
+                    result = future.result()
+                except QuotaExceededError as e:
+                    deferred += 1
+                    if not quota_exceeded:
+                        quota_exceeded = True
+                        print(f"{e} Stopping; resume the run once the quota allows.")
+                        for other in futures:
+                            other.cancel()
+                    continue
+                except Exception as e:
+                    print(f"Error processing query {record['id']}: {e}")
+                    result = None
+
+                if result is None:
+                    failed += 1
+                    continue
+
+                with self.output_lock:
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    # Flush per line so an interrupted run loses at most the in-flight queries
+                    out.flush()
+                    metrics.add_latency(result["latency"])
+                    metrics.add_token_usage(result["token_usage"])
+                    metrics.increment_query_count()
+                completed += 1
+
+        return {
+            "total": len(queries),
+            "skipped": len(queries) - len(pending),
+            "completed": completed,
+            "failed": failed,
+            "deferred": deferred,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through the RAG chatbot within API quotas.")
+    parser.add_argument("input", help="JSONL file with one {\"id\": ..., \"query\": ...} object per line.")
+    parser.add_argument("output", help="JSONL file for answers and metrics; also used to resume interrupted runs.")
+    parser.add_argument("--workers", type=int, default=BULK_MAX_WORKERS, help="Maximum concurrent queries.")
+    args = parser.parse_args()
+
+    runner = BulkRunner(max_workers=args.workers)
+    summary = runner.run(args.input, args.output)
+
+    print("\n--- Bulk Run Summary ---")
+    print(f"  Total: {summary['total']}, Skipped: {summary['skipped']}, "
+          f"Completed: {summary['completed']}, Failed: {summary['failed']}, Deferred: {summary['deferred']}")
+    print(runner.chatbot.get_metrics())
+
+if __name__ == "__main__":
+    main()
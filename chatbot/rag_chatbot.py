@@ -1,35 +1,109 @@
 # chatbot/rag_chatbot.py
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from retrieval.hybrid_retriever import HybridRetriever
 from generation.llm_generator import LLMGenerator
+from chatbot.triage import EmergencyTriage
 from utils.metrics import MetricsTracker
-from utils.constants import DISCLAIMER
+from utils.constants import DISCLAIMER, SPECULATIVE_GENERATION, TRIAGE_ENABLED, TRIAGE_USE_CLASSIFIER
 
 class RAGChatbot:
-    def __init__(self):
+    def __init__(self, speculative=SPECULATIVE_GENERATION, triage=TRIAGE_ENABLED, triage_classifier=TRIAGE_USE_CLASSIFIER):
         self.retriever = HybridRetriever()
         self.generator = LLMGenerator()
         self.metrics_tracker = MetricsTracker()
+        self.triage = None
+        if triage:
+            # Reuse the already loaded embedding model for the optional centroid classifier
+            embedding_model = self.retriever.local_retriever.corpus_manager.embedding_model if triage_classifier else None
+            self.triage = EmergencyTriage(embedding_model)
+        self.speculative = speculative
+        # Runs web retrieval and speculative generation alongside the main thread
+        self.executor = ThreadPoolExecutor() if speculative else None
         print("RAGChatbot initialized.")
 
-    def ask(self, query: str) -> str:
+    def ask(self, query: str, on_triage=None) -> str:
         """
         Processes a user query through the RAG pipeline.
         Returns the generated first-aid answer.
+        If the query looks life-threatening, `on_triage` is called with a precomputed safety
+        preamble before retrieval starts, so the user sees it without waiting for the full answer.
         """
         self.metrics_tracker.start_timer()
+
+        if self.triage is not None:
+            triage_start = time.perf_counter()
+            triage_result = self.triage.classify(query)
+            self.metrics_tracker.add_triage(time.perf_counter() - triage_start, matched=triage_result is not None)
+            if triage_result and on_triage:
+                on_triage(triage_result["preamble"])
         
-        # 1. Hybrid Retrieval
-        retrieved_context = self.retriever.retrieve(query)
-        
-        # 2. Answer Generation
-        llm_response = self.generator.generate_answer(query, retrieved_context)
+        if self.speculative:
+            llm_response = self._speculative_generate(query)
+        else:
+            # 1. Hybrid Retrieval
+            retrieved_context = self.retriever.retrieve(query)
+            
+            # 2. Answer Generation
+            llm_response = self.generator.generate_answer(query, retrieved_context)
         
         self.metrics_tracker.stop_timer()
         self.metrics_tracker.add_token_usage(llm_response["token_usage"])
         self.metrics_tracker.increment_query_count()
 
-        full_answer = llm_response["answer"]
+        return self.add_disclaimer(llm_response["answer"])
+
+    def _timed_generate(self, query: str, context: list[dict]) -> tuple[dict, float]:
+        start = time.perf_counter()
+        llm_response = self.generator.generate_answer(query, context)
+        return llm_response, time.perf_counter() - start
+
+    def _speculative_generate(self, query: str) -> dict:
+        """
+        Starts generation on the re-ranked local-only context while web retrieval runs in parallel.
+        The speculative answer is kept if the web results leave the selected context unchanged;
+        otherwise it is discarded and the answer is regenerated on the final context.
+        """
+        # Start the CSE round-trip first so it also overlaps with local embedding and FAISS search
+        web_future = self.executor.submit(self.retriever.retrieve_web, query)
+        local_results = self.retriever.retrieve_local(query)
+
+        if not local_results:
+            # Nothing to speculate on, fall back to the sequential pipeline
+            final_context = self.retriever.select_context(query, web_future.result())
+            return self.generator.generate_answer(query, final_context)
+
+        speculative_context = self.retriever.select_context(query, local_results)
+        speculative_future = self.executor.submit(self._timed_generate, query, speculative_context)
+
+        final_context = self.retriever.merge_context(query, speculative_context, web_future.result())
+        context_ready = time.perf_counter()
+
+        if self._same_context(speculative_context, final_context):
+            llm_response, generation_time = speculative_future.result()
+            # Without speculation, generation would only have started once the final context was ready
+            latency_saved = context_ready + generation_time - time.perf_counter()
+            self.metrics_tracker.record_speculation(hit=True, latency_saved=max(latency_saved, 0.0))
+            return llm_response
+
+        print("Web results changed the context; discarding the speculative answer.")
+        self.metrics_tracker.record_speculation(hit=False)
+        if not speculative_future.cancel():
+            # Already running: let it finish in the background, but still account for the tokens it spent
+            speculative_future.add_done_callback(
+                lambda f: self.metrics_tracker.add_token_usage(f.result()[0]["token_usage"])
+            )
+        return self.generator.generate_answer(query, final_context)
+
+    def _same_context(self, context_a: list[dict], context_b: list[dict]) -> bool:
+        """Two contexts are the same if they produce the same prompt: same documents in the same order."""
+        key = lambda doc: (doc["source"], doc["content"], doc.get("link"))
+        return [key(doc) for doc in context_a] == [key(doc) for doc in context_b]
+
+    def add_disclaimer(self, answer: str) -> str:
+        """Ensures the disclaimer wraps the generated answer."""
+        full_answer = answer
         # Ensure the disclaimer is always present at the beginning (primary requirement)
         # And at the end, just in case (as a fallback safety measure).
         if not full_answer.strip().startswith(DISCLAIMER.strip()):
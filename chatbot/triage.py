@@ -0,0 +1,207 @@
+# chatbot/triage.py
+
+import re
+import numpy as np
+from data.medical_snippets import MEDICAL_SNIPPETS
+from utils.constants import TRIAGE_CENTROID_THRESHOLD
+
+# Someone other than the writer: a person in cardiac arrest or unconscious cannot be the one typing
+PERSON = (
+    r"(?:\b(?:he|she|they|him|them|someone|somebody)"
+    r"|\b(?:my|our|the|his|her|their|a)\s+(?:[\w-]+\s+){0,3}?"
+    r"(?:mom|mum|mother|dad|father|husband|wife|son|daughter|child|kid|baby|brother|sister|grandma|grandmother"
+    r"|grandpa|grandfather|friend|partner|neighbou?r|colleague|coworker|patient|man|woman|boy|girl|person|uncle|aunt)"
+    r"|\b(?:grandma|grandpa|mom|mum|dad))"
+)
+# Words between the subject and the predicate ("'s", "is lying on the floor", "has diabetes and is").
+# First-person words end the gap, so "my daughter says I'm not breathing well" is not about the daughter.
+GAP = r"(?:'s\b|\s+(?!(?:i|i'm|im|i've|me|myself|we|we're|us)\b)[\w'-]+){0,8}?"
+# "not" / "isn't" / "aren't" / "no longer", after a GAP that may hold the "is"
+NOT = r"\s+(?:not|isn'?t|aren'?t|no\s+longer)"
+
+# Phrases describing past events ("had a heart attack 5 years ago") are ignored by the matcher
+HISTORY_MARKERS = (
+    r"(?:years?|months?|weeks?|days?)\s+ago|last\s+(?:year|month|week)|in\s+the\s+past|history\s+of"
+    r"|previous(?:ly)?|used\s+to|recover(?:ed|ing|y)?\s+from|years?\s+back|when\s+i\s+was"
+)
+HISTORY_PATTERN = re.compile(rf"\b(?:{HISTORY_MARKERS})\b", re.IGNORECASE)
+# A relative or "with" clause up to its history marker: "who had a stroke last year", "with a history of"
+RELATIVE_HISTORY = re.compile(rf"\b(?:who|which|that|whose|with)\b.*?\b(?:{HISTORY_MARKERS})\b", re.IGNORECASE)
+CLAUSE_SPLIT = re.compile(r"[.;!?]")
+# Sub-clauses within a sentence; those mentioning history are dropped and the rest rejoined
+SUBCLAUSE_SPLIT = re.compile(r"[,()\u2013\u2014]|\s-\s|\b(?:but|now)\b", re.IGNORECASE)
+# Mentions that make hypoglycaemia a likely cause of unconsciousness
+DIABETES_PATTERN = re.compile(r"\b(?:diabet\w*|insulin|sugar|glucose|hypo(?:glyc\w*)?|glucagon)\b", re.IGNORECASE)
+
+# Life-threatening presentations, in priority order (the first match wins).
+# Snippets must be verbatim entries of MEDICAL_SNIPPETS so the preamble stays source-cited;
+# "diabetes_snippets" are only added when the query also mentions diabetes, insulin or low sugar.
+EMERGENCY_PROTOCOLS = [
+    {
+        "category": "Suspected cardiac arrest",
+        "patterns": [
+            r"\b(?:in|into|having)\s+(?:a\s+)?cardiac arrest\b",
+            # "not breathing normally/properly" is a cardiac arrest sign; "well/easily/deeply" describe breathlessness
+            PERSON + GAP + r"(?:" + NOT + r"|\s+stopped)\s+breathing\b(?!\s+(?:well|easily|deeply|through))",
+            PERSON + r"(?:'s|\s+(?:has|have|just|suddenly|then))*\s+collapsed\b",
+            r"\b(?:has|have|there'?s|there\s+is|with)\s+no\s+(?:pulse|heartbeat)\b",
+            r"\b(?:can'?t|cannot|couldn'?t)\s+(?:find|feel)\s+(?:a|his|her|their)\s+(?:pulse|heartbeat)\b",
+        ],
+        "examples": [
+            "He collapsed and is not breathing",
+            "She has no pulse and isn't responding",
+            "I think my father is in cardiac arrest",
+        ],
+        "snippets": [
+            "High-quality CPR compressions: depth 5–6 cm at 100–120 compressions per minute.",
+            "Automated external defibrillators give voice prompts and will not shock without need.",
+            "Ventricular fibrillation is a shockable rhythm requiring early defibrillation.",
+        ],
+    },
+    {
+        "category": "Unconsciousness",
+        "patterns": [
+            PERSON + GAP + r"\s+(?:unconscious|unresponsive)\b",
+            PERSON + GAP + NOT + r"\s+(?:responding|responsive|conscious|waking(?:\s+up)?)\b",
+            PERSON + GAP + r"\s+(?:won'?t|will\s+not|can'?t|cannot)\s+(?:wake\s+up|be\s+woken|be\s+roused)\b",
+            r"\b(?:can'?t|cannot|couldn'?t)\s+(?:wake|rouse)\s+(?:him|her|them)\b",
+            PERSON + GAP + r"\s+(?:passed\s+out|fainted|blacked\s+out)\b",
+        ],
+        "examples": [
+            "My mother is unconscious",
+            "He passed out and we can't wake him up",
+            "She is unresponsive and won't open her eyes",
+        ],
+        # If breathing stops, unconsciousness becomes cardiac arrest
+        "snippets": [
+            "High-quality CPR compressions: depth 5–6 cm at 100–120 compressions per minute.",
+            "Automated external defibrillators give voice prompts and will not shock without need.",
+        ],
+        "diabetes_snippets": [
+            "For severe hypoglycaemia with unconsciousness, give intramuscular glucagon 1 mg if available.",
+        ],
+    },
+    {
+        "category": "Suspected heart attack",
+        "patterns": [
+            r"\bcrushing\s+chest\b",
+            r"\bhaving\s+(?:a\s+)?heart\s+attack\b",
+            r"\bthis\s+(?:is\s+)?a\s+heart\s+attack\b",
+            r"\bchest\s+(?:pain|pressure|tightness)\b.{0,40}?(?:\bleft\s+arm\b|\barm\b|\bjaw\b|\bshoulder\b|\bradiat\w*|\bshoot\w*|\bspread\w*)",
+            r"\b(?:severe|sudden)\s+chest\s+(?:pain|pressure|tightness)\b",
+        ],
+        "examples": [
+            "Crushing chest pain shooting down my left arm",
+            "I think I'm having a heart attack",
+            "Sudden severe pressure in my chest spreading to my jaw",
+        ],
+        "snippets": [
+            "Call emergency services immediately at the first suspicion of heart attack.",
+            "Chewable aspirin 160–325 mg is recommended if no contraindication to antiplatelets.",
+            "Sudden chest pain radiating to the left arm may indicate myocardial infarction.",
+        ],
+    },
+]
+
+class EmergencyTriage:
+    """
+    Flags life-threatening presentations before the RAG pipeline runs.
+    A compiled pattern matcher handles the common phrasings; an optional nearest-centroid
+    classifier on the query embedding catches paraphrases the patterns miss.
+    Each match returns a preamble precomputed at start-up, so triage costs no model or API calls.
+    """
+    def __init__(self, embedding_model=None, threshold=TRIAGE_CENTROID_THRESHOLD):
+        self.protocols = []
+        for protocol in EMERGENCY_PROTOCOLS:
+            diabetes_snippets = protocol.get("diabetes_snippets", [])
+            missing = [s for s in protocol["snippets"] + diabetes_snippets if s not in MEDICAL_SNIPPETS]
+            if missing:
+                raise ValueError(f"Triage snippets for '{protocol['category']}' not found in MEDICAL_SNIPPETS: {missing}")
+            preamble = self._build_preamble(protocol["category"], protocol["snippets"])
+            self.protocols.append({
+                "category": protocol["category"],
+                "pattern": re.compile("|".join(f"(?:{p})" for p in protocol["patterns"]), re.IGNORECASE),
+                "preamble": preamble,
+                "diabetes_preamble": (
+                    self._build_preamble(protocol["category"], protocol["snippets"] + diabetes_snippets)
+                    if diabetes_snippets else preamble
+                ),
+            })
+
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.centroids = self._build_centroids() if embedding_model is not None else None
+
+    def _build_preamble(self, category: str, snippets: list[str]) -> str:
+        """Formats a safety preamble, citing snippets the same way LLMGenerator does."""
+        steps = "\n".join(f"{i+1}. {snippet}" for i, snippet in enumerate(snippets))
+        citations = "\n".join(f"- Local Snippet: \"{snippet}\"" for snippet in snippets)
+        return (
+            f"POSSIBLE EMERGENCY: {category}\n"
+            f"Call emergency services immediately. Do not wait for the full answer.\n"
+            f"Immediate Steps:\n{steps}\n"
+            f"Source Citations:\n{citations}"
+        )
+
+    def _build_centroids(self) -> np.ndarray:
+        """One L2-normalised centroid per protocol, from its example phrasings and cited snippets."""
+        centroids = []
+        for protocol in EMERGENCY_PROTOCOLS:
+            embeddings = self.embedding_model.get_embeddings(protocol["examples"] + protocol["snippets"])
+            centroid = embeddings.mean(axis=0)
+            centroids.append(centroid / np.linalg.norm(centroid))
+        return np.vstack(centroids)
+
+    def _result(self, protocol: dict, query: str, matched_by: str) -> dict:
+        preamble = protocol["diabetes_preamble"] if DIABETES_PATTERN.search(query) else protocol["preamble"]
+        return {"category": protocol["category"], "preamble": preamble, "matched_by": matched_by}
+
+    def _present_clauses(self, query: str) -> list[str]:
+        """
+        Splits the query into sentences with the parts about past events removed, so
+        "My father, who had a stroke last year, collapsed" becomes "My father collapsed".
+        """
+        clauses = []
+        for sentence in CLAUSE_SPLIT.split(query):
+            parts = [RELATIVE_HISTORY.sub(" ", part).strip() for part in SUBCLAUSE_SPLIT.split(sentence)]
+            kept = " ".join(part for part in parts if part and not HISTORY_PATTERN.search(part))
+            if kept:
+                clauses.append(kept)
+        return clauses
+
+    def classify(self, query: str) -> dict | None:
+        """
+        Returns a dict with 'category', 'preamble' and 'matched_by' ('pattern' or 'classifier')
+        for a life-threatening presentation, or None.
+        """
+        query = query.replace("\u2019", "'") # Curly apostrophes from mobile keyboards
+        clauses = self._present_clauses(query)
+        if not clauses:
+            return None
+
+        for protocol in self.protocols:
+            if any(protocol["pattern"].search(clause) for clause in clauses):
+                return self._result(protocol, query, "pattern")
+
+        if self.centroids is None:
+            return None
+
+        query_embedding = self.embedding_model.get_embeddings([" ".join(clauses)])[0]
+        similarities = self.centroids @ (query_embedding / np.linalg.norm(query_embedding))
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._result(self.protocols[best], query, "classifier")
+
+if __name__ == "__main__":
+    # Example usage (pattern matcher only):
+    triage = EmergencyTriage()
+    for query in [
+        "Crushing chest pain shooting down my left arm-do I chew aspirin first or call an ambulance?",
+        "My diabetic father just became unconscious; we think his sugar crashed.",
+        "I'm having angina; how many nitroglycerin tablets can I safely take?",
+    ]:
+        result = triage.classify(query)
+        print(f"\n'{query}' -> {result['category'] if result else 'no emergency flagged'}")
+        if result:
+            print(result["preamble"])
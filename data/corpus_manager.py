@@ -5,22 +5,28 @@ import numpy as np
 import os
 from data.medical_snippets import MEDICAL_SNIPPETS
 from retrieval.embedding_model import EmbeddingModel
-from utils.constants import EMBEDDING_MODEL_NAME
+from utils.constants import EMBEDDING_MODEL_NAME, FAISS_INDEX_TYPE, HNSW_M
 
 class CorpusManager:
-    def __init__(self, model_name=EMBEDDING_MODEL_NAME):
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME, index_type=FAISS_INDEX_TYPE):
         self.snippets = MEDICAL_SNIPPETS
         self.embedding_model = EmbeddingModel(model_name)
+        self.index_type = index_type
         self.index = None
         self.snippet_embeddings = None
         self._build_index()
 
     def _build_index(self):
         """Builds the FAISS index for the medical snippets."""
-        print(f"Building FAISS index for {len(self.snippets)} snippets...")
+        print(f"Building FAISS {self.index_type} index for {len(self.snippets)} snippets...")
         self.snippet_embeddings = self.embedding_model.get_embeddings(self.snippets)
         d = self.snippet_embeddings.shape[1] # Dimension of embeddings
-        self.index = faiss.IndexFlatL2(d) # L2 distance for similarity
+        if self.index_type == "flat":
+            self.index = faiss.IndexFlatL2(d) # L2 distance for similarity
+        elif self.index_type == "hnsw":
+            self.index = faiss.IndexHNSWFlat(d, HNSW_M) # Approximate L2 search
+        else:
+            raise ValueError(f"Unknown FAISS index type: {self.index_type}")
         self.index.add(self.snippet_embeddings)
         print("FAISS index built successfully.")
 
@@ -36,6 +42,8 @@ class CorpusManager:
         
         results = []
         for i, score in zip(I[0], D[0]):
+            if i < 0: # FAISS pads with -1 when fewer than k neighbours are found
+                continue
             results.append({
                 "content": self.snippets[i],
                 "score": score,
@@ -0,0 +1,29 @@
+# data/labelled_queries.py
+
+# Labelled sample queries, used by the functional tests and the retrieval tuner
+SAMPLE_QUERIES = [
+    "I'm sweating, shaky, and my glucometer reads 55 mg/dL—what should I do right now?",
+    "My diabetic father just became unconscious; we think his sugar crashed. What immediate first-aid should we give?",
+    "A pregnant woman with gestational diabetes keeps getting fasting readings around 130 mg/dL. What does this mean and how should we manage it?",
+    "Crushing chest pain shooting down my left arm-do I chew aspirin first or call an ambulance?",
+    "I'm having angina; how many nitroglycerin tablets can I safely take and when must I stop?",
+    "Grandma has chronic heart failure, is suddenly short of breath, and her ankles are swelling. Any first-aid steps before we reach the ER?",
+    "After working in the sun all day I've barely urinated and my creatinine just rose 0.4 mg/dL-could this be acute kidney injury and what should I do?",
+    "CKD patient with a potassium level of 6.1 mmol/L—what emergency measures can we start right away?",
+    "I took ibuprofen for back pain; now my flanks hurt and I'm worried about kidney damage-any immediate precautions?",
+    "Type 2 diabetic, extremely thirsty, glucose meter says 'HI' but urine ketone strip is negative-what's happening and what's the first-aid?"
+]
+
+# Expected conditions/keywords for each query (for basic validation)
+EXPECTED_INFO = {
+    SAMPLE_QUERIES[0]: {"condition": "Hypoglycaemia", "keywords": ["glucose", "carbohydrate"]},
+    SAMPLE_QUERIES[1]: {"condition": "Hypoglycaemia", "keywords": ["unconscious", "glucagon", "emergency"]},
+    SAMPLE_QUERIES[2]: {"condition": "Gestational diabetes", "keywords": ["pregnancy", "manage"]},
+    SAMPLE_QUERIES[3]: {"condition": "Myocardial infarction", "keywords": ["emergency services", "aspirin", "chest pain"]},
+    SAMPLE_QUERIES[4]: {"condition": "Angina", "keywords": ["nitroglycerin", "doses"]},
+    SAMPLE_QUERIES[5]: {"condition": "Heart failure", "keywords": ["short of breath", "edema", "upright"]},
+    SAMPLE_QUERIES[6]: {"condition": "Acute kidney injury", "keywords": ["AKI", "creatinine", "hydration"]},
+    SAMPLE_QUERIES[7]: {"condition": ["Hyperkalaemia", "Hyperkalemia"], "keywords": ["potassium", "emergency measures", "calcium gluconate", "insulin–glucose infusion", "stabilize heart rhythm"]},
+    SAMPLE_QUERIES[8]: {"condition": ["Acute Kidney Injury", "AKI", "Kidney damage"], "keywords": ["NSAIDs", "AKI", "precautions", "ibuprofen", "stop taking"]}, # MODIFIED
+    SAMPLE_QUERIES[9]: {"condition": "Hyperosmolar hyperglycaemic state", "keywords": ["thirsty", "glucose", "ketones", "dehydration"]},
+}
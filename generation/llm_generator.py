@@ -11,7 +11,8 @@ class LLMGenerator:
         self.model_name = model_name
         print(f"LLM initialized with Groq model: {self.model_name}")
 
-    def _format_context(self, context_snippets: list[dict]) -> str:
+    @staticmethod
+    def _format_context(context_snippets: list[dict]) -> str:
         """Formats the retrieved context for the LLM prompt."""
         formatted_context = []
         for i, snippet in enumerate(context_snippets):
@@ -26,21 +27,27 @@ class LLMGenerator:
             formatted_context.append(f"[{source_info}]\n{content}")
         return "\n\n".join(formatted_context)
 
-    def generate_answer(self, query: str, context_snippets: list[dict]) -> dict:
-        """
-        Generates an answer using the LLM based on the query and retrieved context.
-        Returns a dict containing the answer, token usage, and relevant sources.
-        """
-        formatted_context = self._format_context(context_snippets)
+    @staticmethod
+    def build_messages(query: str, context_snippets: list[dict]) -> list[dict]:
+        """Builds the chat messages sent to the LLM for a query and its context. Needs no Groq client."""
+        formatted_context = LLMGenerator._format_context(context_snippets)
         
         system_message_content = SYSTEM_PROMPT_TEMPLATE.format(disclaimer=DISCLAIMER)
         user_message_content = USER_PROMPT_TEMPLATE.format(query=query, context=formatted_context)
 
-        messages = [
+        return [
             {"role": "system", "content": system_message_content},
             {"role": "user", "content": user_message_content},
         ]
 
+    def generate_answer(self, query: str, context_snippets: list[dict], raise_errors: bool = False) -> dict:
+        """
+        Generates an answer using the LLM based on the query and retrieved context.
+        Returns a dict containing the answer, token usage, and relevant sources.
+        API errors are logged and a fallback answer returned, unless `raise_errors` is set.
+        """
+        messages = self.build_messages(query, context_snippets)
+
         try:
             chat_completion = self.client.chat.completions.create(
                 messages=messages,
@@ -70,6 +77,8 @@ class LLMGenerator:
 
         except Exception as e: # Catch broader exceptions for API calls
             print(f"An error occurred during Groq API call: {e}")
+            if raise_errors:
+                raise
             return {
                 "answer": f"{DISCLAIMER}\n\nI apologize, but I encountered an issue connecting to the AI. Please ensure your GROQ_API_KEY is correct and try again later.",
                 "token_usage": 0,
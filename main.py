@@ -2,6 +2,11 @@
 
 from chatbot.rag_chatbot import RAGChatbot
 
+def show_triage_preamble(preamble: str):
+    print("\n--- Emergency Triage ---")
+    print(preamble)
+    print("\nPreparing full first-aid guidance...")
+
 def main():
     chatbot = RAGChatbot()
     print("\n--- Welcome to the RAG-Powered First-Aid Chatbot ---")
@@ -19,7 +24,7 @@ def main():
             continue
 
         print("\nProcessing your request...")
-        response = chatbot.ask(user_query)
+        response = chatbot.ask(user_query, on_triage=show_triage_preamble)
         print("\n--- Chatbot's First-Aid Guidance ---")
         print(response)
 
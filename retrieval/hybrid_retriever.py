@@ -3,44 +3,75 @@
 from retrieval.local_retriever import LocalRetriever
 from retrieval.web_retriever import WebRetriever
 from retrieval.re_ranker import ReRanker
-from utils.constants import LOCAL_K, WEB_K, FINAL_CONTEXT_N
+from utils.constants import LOCAL_K, WEB_K, FINAL_CONTEXT_N, FAISS_INDEX_TYPE, RERANKER_MODEL_NAME
 
 class HybridRetriever:
-    def __init__(self):
-        self.local_retriever = LocalRetriever()
+    def __init__(self, local_k=LOCAL_K, web_k=WEB_K, final_context_n=FINAL_CONTEXT_N,
+                 index_type=FAISS_INDEX_TYPE, reranker_model_name=RERANKER_MODEL_NAME):
+        self.local_k = local_k
+        self.web_k = web_k
+        self.final_context_n = final_context_n
+        self.local_retriever = LocalRetriever(index_type=index_type)
         self.web_retriever = WebRetriever()
-        self.re_ranker = ReRanker()
+        self.re_ranker = ReRanker(reranker_model_name)
 
-    def retrieve(self, query: str) -> list[dict]:
-        """
-        Performs hybrid retrieval (local + web) and re-ranks the results.
-        Returns a list of top N relevant documents.
-        Each document dict will have at least 'content', 'source', and 're_rank_score'.
-        Web results will also have 'title' and 'link'.
-        """
+    def retrieve_local(self, query: str) -> list[dict]:
+        """Retrieves the top LOCAL_K snippets from the local corpus."""
         print(f"Performing local search for '{query}'...")
-        local_results = self.local_retriever.retrieve(query, k=LOCAL_K)
+        local_results = self.local_retriever.retrieve(query, k=self.local_k)
         print(f"Found {len(local_results)} local results.")
+        return local_results
 
+    def retrieve_web(self, query: str, raise_errors: bool = False) -> list[dict]:
+        """Retrieves the top WEB_K results from Google CSE. See WebRetriever.retrieve for `raise_errors`."""
         print(f"Performing web search for '{query}'...")
-        web_results = self.web_retriever.retrieve(query, k=WEB_K)
+        web_results = self.web_retriever.retrieve(query, k=self.web_k, raise_errors=raise_errors)
         print(f"Found {len(web_results)} web results.")
+        return web_results
 
-        all_results = local_results + web_results
-        
-        if not all_results:
+    def select_context(self, query: str, documents: list[dict]) -> list[dict]:
+        """Re-ranks the documents and returns the top N for the final context."""
+        if not documents:
             print("No results from either local or web search.")
             return []
 
-        print(f"Re-ranking {len(all_results)} combined results...")
-        re_ranked_results = self.re_ranker.re_rank(query, all_results)
+        print(f"Re-ranking {len(documents)} combined results...")
+        re_ranked_results = self.re_ranker.re_rank(query, documents)
         
         # Select the top N for the final context
-        final_context = re_ranked_results[:FINAL_CONTEXT_N]
+        final_context = re_ranked_results[:self.final_context_n]
         print(f"Selected top {len(final_context)} results for context.")
         
         return final_context
 
+    def merge_context(self, query: str, context: list[dict], new_documents: list[dict]) -> list[dict]:
+        """
+        Folds newly retrieved documents into an already re-ranked context.
+        Cross-encoder scores are per (query, document) pair, so only the new documents need scoring;
+        the result is the same top N that select_context would give on the combined documents.
+        """
+        if not new_documents:
+            return context
+
+        print(f"Re-ranking {len(new_documents)} additional results...")
+        re_ranked_new = self.re_ranker.re_rank(query, new_documents)
+        merged = sorted(context + re_ranked_new, key=lambda x: x.get('re_rank_score', -float('inf')), reverse=True)
+        final_context = merged[:self.final_context_n]
+        print(f"Selected top {len(final_context)} results for context.")
+
+        return final_context
+
+    def retrieve(self, query: str) -> list[dict]:
+        """
+        Performs hybrid retrieval (local + web) and re-ranks the results.
+        Returns a list of top N relevant documents.
+        Each document dict will have at least 'content', 'source', and 're_rank_score'.
+        Web results will also have 'title' and 'link'.
+        """
+        local_results = self.retrieve_local(query)
+        web_results = self.retrieve_web(query)
+        return self.select_context(query, local_results + web_results)
+
 if __name__ == "__main__":
     # Example usage:
     hybrid_retriever = HybridRetriever()
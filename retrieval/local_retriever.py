@@ -1,11 +1,11 @@
 # retrieval/local_retriever.py
 
 from data.corpus_manager import CorpusManager
-from utils.constants import EMBEDDING_MODEL_NAME
+from utils.constants import EMBEDDING_MODEL_NAME, FAISS_INDEX_TYPE
 
 class LocalRetriever:
-    def __init__(self, model_name=EMBEDDING_MODEL_NAME):
-        self.corpus_manager = CorpusManager(model_name)
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME, index_type=FAISS_INDEX_TYPE):
+        self.corpus_manager = CorpusManager(model_name, index_type=index_type)
 
     def retrieve(self, query: str, k: int = 5):
         """
@@ -1,9 +1,10 @@
 # retrieval/re_ranker.py
 
 from sentence_transformers import CrossEncoder
+from utils.constants import RERANKER_MODEL_NAME
 
 class ReRanker:
-    def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-6-v2"):
+    def __init__(self, model_name=RERANKER_MODEL_NAME):
         self.model_name = model_name
         self._load_model()
 
@@ -0,0 +1,220 @@
+# retrieval/tuner.py
+
+import argparse
+import itertools
+import json
+import time
+from retrieval.local_retriever import LocalRetriever
+from retrieval.web_retriever import WebRetriever
+from retrieval.re_ranker import ReRanker
+from generation.llm_generator import LLMGenerator
+from data.labelled_queries import SAMPLE_QUERIES, EXPECTED_INFO
+from utils.constants import RERANKER_MODEL_NAME
+
+# Parameter values swept by default. web_k=0 measures a local-only pipeline.
+DEFAULT_GRID = {
+    "index_type": ["flat", "hnsw"],
+    "reranker_model_name": [RERANKER_MODEL_NAME, "cross-encoder/ms-marco-MiniLM-L-12-v2"],
+    "local_k": [3, 5, 10, 15],
+    "web_k": [0, 3, 5, 10],
+    "final_context_n": [3, 5, 8, 12],
+}
+CHARS_PER_TOKEN = 4 # Rough chars-per-token ratio for Llama-family tokenizers
+RECALL_TOLERANCE = 0.02 # Recall we are willing to give up for a faster configuration
+TIMING_REPEATS = 3 # Timed runs averaged per measurement, after an untimed warm-up
+
+def load_sample_queries() -> list[dict]:
+    """Loads the labelled SAMPLE_QUERIES / EXPECTED_INFO pairs also used by the functional tests."""
+    return [{"query": q, **EXPECTED_INFO.get(q, {})} for q in SAMPLE_QUERIES]
+
+def load_labelled_queries(path: str) -> list[dict]:
+    """Loads a JSONL labelled set: {"query": str, "condition": str | list[str], "keywords": list[str]} per line."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def timed(fn, repeats: int = TIMING_REPEATS):
+    """Calls `fn` `repeats` times and returns (last result, mean seconds per call)."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeats
+
+def retrieval_recall(context: list[dict], expected: dict) -> float:
+    """
+    Fraction of the expected information found in the retrieved context.
+    The condition counts as one item (any of its alternatives may match); each keyword is one item.
+    """
+    text = " ".join(f"{doc.get('title', '')} {doc['content']}" for doc in context).lower()
+    items = []
+    if "condition" in expected:
+        conditions = [expected["condition"]] if isinstance(expected["condition"], str) else expected["condition"]
+        items.append(conditions)
+    for keyword in expected.get("keywords", []):
+        items.append([keyword])
+    if not items:
+        return 0.0
+    hits = sum(1 for alternatives in items if any(alt.lower() in text for alt in alternatives))
+    return hits / len(items)
+
+def pareto_frontier(results: list[dict]) -> list[dict]:
+    """Returns the configurations not dominated on (recall up, latency down, prompt tokens down)."""
+    def dominates(a, b):
+        no_worse = (a["recall"] >= b["recall"] and a["latency"] <= b["latency"]
+                    and a["prompt_tokens"] <= b["prompt_tokens"])
+        better = (a["recall"] > b["recall"] or a["latency"] < b["latency"]
+                  or a["prompt_tokens"] < b["prompt_tokens"])
+        return no_worse and better
+
+    frontier = [r for r in results if not any(dominates(other, r) for other in results)]
+    return sorted(frontier, key=lambda r: (-r["recall"], r["latency"]))
+
+def recommend(frontier: list[dict], recall_tolerance: float = RECALL_TOLERANCE) -> dict | None:
+    """Picks the fastest frontier configuration whose recall is within `recall_tolerance` of the best."""
+    if not frontier:
+        return None
+    best_recall = max(r["recall"] for r in frontier)
+    candidates = [r for r in frontier if r["recall"] >= best_recall - recall_tolerance]
+    return min(candidates, key=lambda r: (r["latency"], r["prompt_tokens"]))
+
+class RetrievalTuner:
+    """
+    Offline sweep of retrieval parameters against labelled queries.
+    For every configuration it measures retrieval recall, per-stage latency and estimated prompt tokens.
+    Web results are fetched once per query at the largest web_k and truncated per configuration,
+    so a sweep costs one CSE call per query regardless of grid size.
+    Each index and re-ranker gets an untimed warm-up call after loading, so the first configuration
+    timed on it does not pay for lazy initialisation, and local/re-rank timings are averaged over `repeats` runs.
+    """
+    def __init__(self, labelled_queries: list[dict], grid=DEFAULT_GRID, repeats=TIMING_REPEATS):
+        self.labelled_queries = labelled_queries
+        self.grid = grid
+        self.repeats = repeats
+        self.web_retriever = WebRetriever() if max(grid["web_k"]) > 0 else None
+        self.re_rankers = {}
+
+    def _get_re_ranker(self, model_name: str) -> ReRanker:
+        if model_name not in self.re_rankers:
+            re_ranker = ReRanker(model_name)
+            query = self.labelled_queries[0]["query"]
+            re_ranker.re_rank(query, [{"content": query}]) # Warm-up
+            self.re_rankers[model_name] = re_ranker
+        return self.re_rankers[model_name]
+
+    def _fetch_web_results(self) -> list[tuple[list[dict], float]]:
+        """Fetches web results for every query once, returning (results, latency) pairs."""
+        max_web_k = max(self.grid["web_k"])
+        fetched = []
+        for item in self.labelled_queries:
+            if self.web_retriever is None:
+                fetched.append(([], 0.0))
+                continue
+            start = time.perf_counter()
+            results = self.web_retriever.retrieve(item["query"], k=max_web_k)
+            fetched.append((results, time.perf_counter() - start))
+        return fetched
+
+    def _estimate_prompt_tokens(self, query: str, context: list[dict]) -> int:
+        messages = LLMGenerator.build_messages(query, context)
+        return sum(len(m["content"]) for m in messages) // CHARS_PER_TOKEN
+
+    def run(self) -> list[dict]:
+        """Sweeps the grid and returns one result dict (config + averaged measurements) per configuration."""
+        web_results = self._fetch_web_results()
+        n_queries = len(self.labelled_queries)
+        results = []
+
+        for index_type in self.grid["index_type"]:
+            local_retriever = LocalRetriever(index_type=index_type)
+            local_retriever.retrieve(self.labelled_queries[0]["query"], k=max(self.grid["local_k"])) # Warm-up
+            for local_k in self.grid["local_k"]:
+                local_runs = [
+                    timed(lambda: local_retriever.retrieve(item["query"], k=local_k), self.repeats)
+                    for item in self.labelled_queries
+                ]
+
+                for web_k, reranker_model_name in itertools.product(self.grid["web_k"], self.grid["reranker_model_name"]):
+                    re_ranker = self._get_re_ranker(reranker_model_name)
+                    totals = {n: {"recall": 0.0, "prompt_tokens": 0} for n in self.grid["final_context_n"]}
+                    local_latency = web_latency = rerank_latency = 0.0
+
+                    for item, (local_docs, local_time), (web_docs, web_time) in zip(self.labelled_queries, local_runs, web_results):
+                        # ReRanker mutates documents in place, so hand it copies
+                        candidates = [dict(doc) for doc in local_docs] + [dict(doc) for doc in web_docs[:web_k]]
+                        ranked, rerank_time = timed(lambda: re_ranker.re_rank(item["query"], candidates), self.repeats)
+                        rerank_latency += rerank_time
+                        local_latency += local_time
+                        web_latency += web_time if web_k > 0 else 0.0
+
+                        # Re-ranking is independent of N, so every final_context_n reuses the same ranking
+                        for n in self.grid["final_context_n"]:
+                            context = ranked[:n]
+                            totals[n]["recall"] += retrieval_recall(context, item)
+                            totals[n]["prompt_tokens"] += self._estimate_prompt_tokens(item["query"], context)
+
+                    stage_latency = {
+                        "local_latency": local_latency / n_queries,
+                        "web_latency": web_latency / n_queries,
+                        "rerank_latency": rerank_latency / n_queries,
+                    }
+                    for n, total in totals.items():
+                        results.append({
+                            "index_type": index_type,
+                            "reranker_model_name": reranker_model_name,
+                            "local_k": local_k,
+                            "web_k": web_k,
+                            "final_context_n": n,
+                            "recall": total["recall"] / n_queries,
+                            "prompt_tokens": total["prompt_tokens"] / n_queries,
+                            **stage_latency,
+                            "latency": sum(stage_latency.values()),
+                        })
+        return results
+
+def _format_result(r: dict) -> str:
+    return (
+        f"index={r['index_type']:<5} reranker={r['reranker_model_name']:<38} "
+        f"local_k={r['local_k']:<3} web_k={r['web_k']:<3} final_n={r['final_context_n']:<3} "
+        f"recall={r['recall']:.3f} latency={r['latency']:.3f}s "
+        f"(local {r['local_latency']:.3f}, web {r['web_latency']:.3f}, rerank {r['rerank_latency']:.3f}) "
+        f"prompt_tokens~{r['prompt_tokens']:.0f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep retrieval parameters and report the recall/latency Pareto frontier.")
+    parser.add_argument("--labelled", action="append", default=[], help="Extra labelled JSONL set (may be repeated).")
+    parser.add_argument("--skip-sample-queries", action="store_true", help="Do not include the SAMPLE_QUERIES from data/labelled_queries.py.")
+    parser.add_argument("--recall-tolerance", type=float, default=RECALL_TOLERANCE, help="Recall the recommendation may trade for speed.")
+    parser.add_argument("--repeats", type=int, default=TIMING_REPEATS, help="Timed runs averaged per local/re-rank measurement.")
+    parser.add_argument("--output", help="Write every configuration's measurements to this JSON file.")
+    args = parser.parse_args()
+
+    labelled_queries = [] if args.skip_sample_queries else load_sample_queries()
+    for path in args.labelled:
+        labelled_queries.extend(load_labelled_queries(path))
+    if not labelled_queries:
+        parser.error("No labelled queries to tune on.")
+
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1.")
+    tuner = RetrievalTuner(labelled_queries, repeats=args.repeats)
+    results = tuner.run()
+    frontier = pareto_frontier(results)
+    best = recommend(frontier, args.recall_tolerance)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "frontier": frontier, "recommended": best}, f, indent=2)
+
+    print(f"\n--- Pareto Frontier ({len(frontier)} of {len(results)} configurations) ---")
+    for r in frontier:
+        print(_format_result(r))
+    print("\n--- Recommended Configuration (utils/constants.py) ---")
+    if best:
+        print(f"LOCAL_K = {best['local_k']}")
+        print(f"WEB_K = {best['web_k']}")
+        print(f"FINAL_CONTEXT_N = {best['final_context_n']}")
+        print(f"FAISS_INDEX_TYPE = \"{best['index_type']}\"")
+        print(f"RERANKER_MODEL_NAME = \"{best['reranker_model_name']}\"")
+
+if __name__ == "__main__":
+    main()
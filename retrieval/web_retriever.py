@@ -2,6 +2,7 @@
 
 from googleapiclient.discovery import build
 import os
+import threading
 from utils.constants import GOOGLE_CSE_API_KEY, GOOGLE_CSE_ID
 
 class WebRetriever:
@@ -10,19 +11,23 @@ class WebRetriever:
             raise ValueError("GOOGLE_CSE_API_KEY or GOOGLE_CSE_ID is not set in environment variables.")
         self.service = build("customsearch", "v1", developerKey=api_key)
         self.cse_id = cse_id
+        # The googleapiclient service (httplib2) is not thread-safe, so serialise calls on it
+        self.lock = threading.Lock()
 
-    def retrieve(self, query: str, k: int = 5):
+    def retrieve(self, query: str, k: int = 5, raise_errors: bool = False):
         """
         Performs a web search using Google Custom Search Engine and returns top k relevant snippets.
         Returns a list of dicts: {"content": str, "title": str, "link": str, "source": "web"}
+        Errors are logged and an empty list returned, unless `raise_errors` is set.
         """
         try:
             # max results per query is 10 for CSE API. Adjust 'num' accordingly.
-            search_results = self.service.cse().list(
-                q=query,
-                cx=self.cse_id,
-                num=min(k, 10) # Max 10 results per call for CSE
-            ).execute()
+            with self.lock:
+                search_results = self.service.cse().list(
+                    q=query,
+                    cx=self.cse_id,
+                    num=min(k, 10) # Max 10 results per call for CSE
+                ).execute()
 
             results = []
             if 'items' in search_results:
@@ -41,6 +46,8 @@ class WebRetriever:
 
         except Exception as e:
             print(f"Error during Google CSE web search: {e}")
+            if raise_errors:
+                raise
             return []
 
 if __name__ == "__main__":
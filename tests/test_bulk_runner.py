@@ -0,0 +1,113 @@
+# tests/test_bulk_runner.py
+import json
+import httpx
+import pytest
+from groq import APIStatusError
+import chatbot.bulk_runner as bulk_runner
+from chatbot.bulk_runner import BulkRunner
+from utils.metrics import MetricsTracker
+
+# Offline tests: the chatbot is replaced with stubs, so no models or APIs are used.
+
+def groq_error(status, retry_after=None):
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    response = httpx.Response(status, headers=headers, request=httpx.Request("POST", "https://api.groq.com"))
+    return APIStatusError(f"Groq returned {status}", response=response, body=None)
+
+class StubRetriever:
+    def __init__(self):
+        self.web_calls = 0
+
+    def retrieve_local(self, query):
+        return [{"content": f"local {query}", "source": "local"}]
+
+    def retrieve_web(self, query, raise_errors=False):
+        self.web_calls += 1
+        if query == "web fails":
+            raise RuntimeError("CSE unavailable")
+        return [{"content": f"web {query}", "source": "web", "title": "t", "link": "l"}]
+
+    def select_context(self, query, documents):
+        return documents
+
+class StubGenerator:
+    """Raises the queued errors in order, then answers."""
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate_answer(self, query, context_snippets, raise_errors=False):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"answer": f"answer to {query}", "token_usage": 100, "sources_used": []}
+
+class StubChatbot:
+    def __init__(self, generator):
+        self.retriever = StubRetriever()
+        self.generator = generator
+        self.metrics_tracker = MetricsTracker()
+
+    def get_metrics(self):
+        return self.metrics_tracker
+
+    def add_disclaimer(self, answer):
+        return answer
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(bulk_runner, "GROQ_RETRY_BACKOFF", 0)
+
+def run_bulk(tmp_path, chatbot, queries, cse_daily_quota=100):
+    input_path, output_path = tmp_path / "queries.jsonl", tmp_path / "answers.jsonl"
+    input_path.write_text("\n".join(json.dumps({"id": i, "query": q}) for i, q in enumerate(queries)))
+    runner = BulkRunner(chatbot=chatbot, max_workers=1, groq_rpm=6000, groq_tpm=10**7,
+                        cse_rpm=6000, cse_daily_quota=cse_daily_quota)
+    summary = runner.run(str(input_path), str(output_path))
+    answered = [json.loads(line)["query"] for line in output_path.read_text().splitlines()]
+    return summary, answered
+
+def test_groq_rate_limit_is_retried_with_same_context(tmp_path):
+    generator = StubGenerator([groq_error(429, retry_after=0), groq_error(503)])
+    chatbot = StubChatbot(generator)
+    summary, answered = run_bulk(tmp_path, chatbot, ["chest pain"])
+
+    assert answered == ["chest pain"]
+    assert summary["completed"] == 1
+    assert generator.calls == 3
+    assert chatbot.retriever.web_calls == 1, "Retries must reuse the retrieved context, not spend more CSE calls."
+
+def test_repeated_groq_rate_limits_stop_the_run(tmp_path):
+    errors = [groq_error(429, retry_after=0) for _ in range(bulk_runner.GROQ_MAX_RETRIES + 1)]
+    chatbot = StubChatbot(StubGenerator(errors))
+    summary, answered = run_bulk(tmp_path, chatbot, ["q1", "q2", "q3"])
+
+    assert answered == []
+    assert summary["deferred"] == 3
+    assert chatbot.retriever.web_calls == 1, "Queued queries must not spend CSE calls once Groq is rate-limiting."
+
+def test_long_retry_after_stops_without_sleeping(tmp_path):
+    chatbot = StubChatbot(StubGenerator([groq_error(429, retry_after=bulk_runner.GROQ_MAX_RETRY_WAIT + 1)]))
+    summary, answered = run_bulk(tmp_path, chatbot, ["q1"])
+    assert answered == []
+    assert summary["deferred"] == 1
+    assert chatbot.generator.calls == 1
+
+def test_client_error_is_not_retried_or_checkpointed(tmp_path):
+    chatbot = StubChatbot(StubGenerator([groq_error(400)]))
+    summary, answered = run_bulk(tmp_path, chatbot, ["q1", "q2"])
+    assert answered == ["q2"]
+    assert summary["failed"] == 1
+    assert chatbot.generator.calls == 2
+
+def test_web_failure_is_not_checkpointed(tmp_path):
+    summary, answered = run_bulk(tmp_path, StubChatbot(StubGenerator()), ["web fails", "ok"])
+    assert answered == ["ok"]
+    assert summary["failed"] == 1
+
+def test_daily_cse_quota_defers_remaining_queries(tmp_path):
+    chatbot = StubChatbot(StubGenerator())
+    summary, answered = run_bulk(tmp_path, chatbot, ["q1", "q2", "q3"], cse_daily_quota=2)
+    assert answered == ["q1", "q2"]
+    assert summary["deferred"] == 1
+    assert chatbot.retriever.web_calls == 2
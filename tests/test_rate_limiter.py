@@ -0,0 +1,100 @@
+# tests/test_rate_limiter.py
+import time
+import pytest
+from utils.rate_limiter import TokenBucket, DailyQuota
+
+def test_acquire_within_capacity_does_not_block():
+    bucket = TokenBucket(capacity=3, refill_rate=1)
+    start = time.perf_counter()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.perf_counter() - start < 0.05
+
+def test_acquire_blocks_until_refilled():
+    bucket = TokenBucket(capacity=1, refill_rate=10) # One token every 0.1 s
+    bucket.acquire()
+    start = time.perf_counter()
+    bucket.acquire()
+    assert time.perf_counter() - start >= 0.08, "Second acquire should wait for the bucket to refill."
+
+def test_acquire_more_than_capacity_is_clamped():
+    bucket = TokenBucket(capacity=5, refill_rate=1)
+    start = time.perf_counter()
+    bucket.acquire(50) # Would never be satisfiable without the clamp
+    assert time.perf_counter() - start < 0.05
+    assert bucket.tokens == pytest.approx(0, abs=0.1)
+
+def test_adjust_can_go_negative_and_delays_next_acquire():
+    bucket = TokenBucket(capacity=1, refill_rate=10)
+    bucket.acquire()
+    bucket.adjust(1) # Real cost was one token more than reserved
+    assert bucket.tokens == pytest.approx(-1, abs=0.1)
+    start = time.perf_counter()
+    bucket.acquire()
+    assert time.perf_counter() - start >= 0.15, "Debt must be repaid before the next acquire."
+
+def test_adjust_refund_is_capped_at_capacity():
+    bucket = TokenBucket(capacity=10, refill_rate=1)
+    bucket.acquire(4)
+    bucket.adjust(-2)
+    assert bucket.tokens == pytest.approx(8, abs=0.1)
+    bucket.adjust(-100)
+    assert bucket.tokens == 10
+
+def test_invalid_bucket_rejected():
+    with pytest.raises(ValueError):
+        TokenBucket(capacity=0, refill_rate=1)
+
+def test_daily_quota_is_a_hard_cap(tmp_path):
+    quota = DailyQuota(limit=2, state_path=str(tmp_path / "quota.json"))
+    assert quota.try_acquire()
+    assert quota.try_acquire()
+    assert not quota.try_acquire()
+    assert quota.remaining() == 0
+
+def test_daily_quota_survives_restart(tmp_path):
+    state_path = str(tmp_path / "quota.json")
+    DailyQuota(limit=3, state_path=state_path).try_acquire()
+    DailyQuota(limit=3, state_path=state_path).try_acquire()
+    restarted = DailyQuota(limit=3, state_path=state_path)
+    assert restarted.remaining() == 1
+    assert restarted.try_acquire()
+    assert not restarted.try_acquire()
+
+def test_daily_quota_resets_on_new_day(tmp_path, monkeypatch):
+    quota = DailyQuota(limit=1, state_path=str(tmp_path / "quota.json"))
+    assert quota.try_acquire()
+    assert not quota.try_acquire()
+    monkeypatch.setattr(quota, "_today", lambda: "2999-01-01")
+    assert quota.remaining() == 1
+    assert quota.try_acquire()
+
+class FakeClock:
+    """Replaces time.monotonic/time.sleep so minute-long limits can be checked instantly."""
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # Real sleeps always make progress; keep float rounding from stalling the fake clock
+        self.now += max(seconds, 1e-6)
+
+@pytest.mark.parametrize("limit", [20, 30, 6000])
+def test_per_minute_never_exceeds_limit_in_any_60s_window(monkeypatch, limit):
+    clock = FakeClock()
+    monkeypatch.setattr("utils.rate_limiter.time", clock)
+    bucket = TokenBucket.per_minute(limit)
+    amount = max(limit // 20, 1)
+
+    admitted = []
+    while clock.now < 300:
+        bucket.acquire(amount)
+        admitted.append(clock.now)
+
+    for i, window_start in enumerate(admitted):
+        in_window = sum(1 for t in admitted[i:] if t < window_start + 60)
+        assert in_window * amount <= limit + 1e-6, f"{in_window * amount} tokens admitted within 60 s of t={window_start:.1f}"
+    # The bound should not be met by starving callers: over 5 minutes close to 5x the limit gets through
+    assert len(admitted) * amount >= 4 * limit
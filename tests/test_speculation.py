@@ -0,0 +1,89 @@
+# tests/test_speculation.py
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from chatbot.rag_chatbot import RAGChatbot
+from retrieval.hybrid_retriever import HybridRetriever
+from utils.metrics import MetricsTracker
+
+# Offline tests: the retrievers, re-ranker and generator are replaced with stubs, so no models or APIs are used.
+
+class StubReRanker:
+    """Scores documents from a fixed table, like a cross-encoder scoring each (query, document) pair independently."""
+    def __init__(self, scores):
+        self.scores = scores
+
+    def re_rank(self, query, documents):
+        for doc in documents:
+            doc['re_rank_score'] = self.scores[doc["content"]]
+        return sorted(documents, key=lambda x: x['re_rank_score'], reverse=True)
+
+class StubRetriever:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def retrieve(self, query, k=5, raise_errors=False):
+        return [dict(doc) for doc in self.documents[:k]]
+
+class StubGenerator:
+    def __init__(self):
+        self.contexts = []
+
+    def generate_answer(self, query, context_snippets):
+        self.contexts.append([doc["content"] for doc in context_snippets])
+        return {"answer": " | ".join(doc["content"] for doc in context_snippets), "token_usage": 10, "sources_used": []}
+
+LOCAL_DOCS = [{"content": f"local {i}", "source": "local"} for i in range(5)]
+WEB_DOCS = [{"content": f"web {i}", "source": "web", "title": f"Web {i}", "link": f"https://example.com/{i}"} for i in range(3)]
+
+def make_retriever(scores, final_context_n=3):
+    retriever = HybridRetriever.__new__(HybridRetriever) # Skip __init__, which loads models and API clients
+    retriever.local_k, retriever.web_k, retriever.final_context_n = len(LOCAL_DOCS), len(WEB_DOCS), final_context_n
+    retriever.local_retriever = StubRetriever(LOCAL_DOCS)
+    retriever.web_retriever = StubRetriever(WEB_DOCS)
+    retriever.re_ranker = StubReRanker(scores)
+    return retriever
+
+def make_chatbot(retriever):
+    bot = RAGChatbot.__new__(RAGChatbot)
+    bot.retriever = retriever
+    bot.generator = StubGenerator()
+    bot.metrics_tracker = MetricsTracker()
+    bot.triage = None
+    bot.speculative = True
+    bot.executor = ThreadPoolExecutor()
+    return bot
+
+# Web documents that either stay below the local top 3 or displace some of them
+LOW_WEB_SCORES = {**{f"local {i}": 10 - i for i in range(5)}, **{f"web {i}": 1 - i for i in range(3)}}
+HIGH_WEB_SCORES = {**{f"local {i}": 10 - i for i in range(5)}, "web 0": 20, "web 1": 8.5, "web 2": 0}
+
+@pytest.mark.parametrize("scores", [LOW_WEB_SCORES, HIGH_WEB_SCORES])
+def test_merge_context_matches_select_context(scores):
+    retriever = make_retriever(scores)
+    query = "chest pain"
+    combined = retriever.select_context(query, retriever.retrieve_local(query) + retriever.retrieve_web(query))
+    local_context = retriever.select_context(query, retriever.retrieve_local(query))
+    merged = retriever.merge_context(query, local_context, retriever.retrieve_web(query))
+    assert [doc["content"] for doc in merged] == [doc["content"] for doc in combined]
+
+def test_speculation_hit_keeps_speculative_answer():
+    bot = make_chatbot(make_retriever(LOW_WEB_SCORES))
+    response = bot.ask("chest pain")
+
+    assert "local 0 | local 1 | local 2" in response
+    assert bot.generator.contexts == [["local 0", "local 1", "local 2"]], "A hit must not regenerate."
+    metrics = bot.get_metrics()
+    assert metrics.speculation_attempts == 1
+    assert metrics.speculation_hits == 1
+    assert metrics.speculation_latency_saved >= 0
+
+def test_speculation_miss_regenerates_on_final_context():
+    bot = make_chatbot(make_retriever(HIGH_WEB_SCORES))
+    response = bot.ask("chest pain")
+
+    assert "web 0 | local 0 | local 1" in response
+    assert ["web 0", "local 0", "local 1"] in bot.generator.contexts
+    metrics = bot.get_metrics()
+    assert metrics.speculation_attempts == 1
+    assert metrics.speculation_hits == 0
+    assert metrics.get_speculation_hit_rate() == 0
@@ -0,0 +1,77 @@
+# tests/test_triage.py
+import pytest
+from chatbot.triage import EmergencyTriage
+from data.medical_snippets import MEDICAL_SNIPPETS
+
+# Queries paired with the emergency category triage should flag (None = no fast-path)
+TRIAGE_CASES = [
+    ("Crushing chest pain shooting down my left arm-do I chew aspirin first or call an ambulance?", "Suspected heart attack"),
+    ("I think I'm having a heart attack", "Suspected heart attack"),
+    ("He had a heart attack 5 years ago but now he has crushing chest pain", "Suspected heart attack"),
+    ("My diabetic father just became unconscious; we think his sugar crashed. What immediate first-aid should we give?", "Unconsciousness"),
+    ("He is not responding", "Unconsciousness"),
+    ("She isn't waking up", "Unconsciousness"),
+    ("He fainted", "Unconsciousness"),
+    ("We can't wake her up", "Unconsciousness"),
+    ("He collapsed and isn't breathing", "Suspected cardiac arrest"),
+    ("My dad isn\u2019t breathing", "Suspected cardiac arrest"),
+    ("He is not breathing normally", "Suspected cardiac arrest"),
+    ("he is gasping and not breathing normally", "Suspected cardiac arrest"),
+    ("my mother isn't breathing properly", "Suspected cardiac arrest"),
+    ("my dad is unconscious and he is not breathing normally", "Suspected cardiac arrest"),
+    ("my son has diabetes and is not breathing", "Suspected cardiac arrest"),
+    ("my dad is lying on the floor not breathing", "Suspected cardiac arrest"),
+    ("He's collapsed", "Suspected cardiac arrest"),
+    ("He collapsed 2 minutes ago", "Suspected cardiac arrest"),
+    ("she's unconscious", "Unconsciousness"),
+    ("He's unresponsive", "Unconsciousness"),
+    ("my 5 year old son is unconscious", "Unconsciousness"),
+    ("My dad is a diabetic with high sugar and is unconscious", "Unconsciousness"),
+    ("He is now unconscious", "Unconsciousness"),
+    # Only the history sub-clause is ignored, not the whole sentence
+    ("My father, who had a stroke last year, collapsed and isn't breathing", "Suspected cardiac arrest"),
+    ("My father who had a stroke last year collapsed", "Suspected cardiac arrest"),
+    ("My husband, a heart patient with a history of angina, is unconscious", "Unconsciousness"),
+    # Chronic, past or first-person situations must not trigger the fast path
+    ("I'm having angina; how many nitroglycerin tablets can I safely take and when must I stop?", None),
+    ("CKD patient with a potassium level of 6.1 mmol/L—what emergency measures can we start right away?", None),
+    ("My lung collapsed last year", None),
+    ("I'm not breathing well after climbing stairs, is that asthma?", None),
+    ("How do I recover from a heart attack I had 5 years ago?", None),
+    ("I can't wake up early in the morning", None),
+    ("What are the signs of a heart attack?", None),
+    ("My daughter says I'm not breathing properly at night", None),
+    ("My mother had a heart attack 5 years ago, is aspirin still needed?", None),
+]
+
+@pytest.fixture(scope="module")
+def triage_instance():
+    """Pattern-only triage; no models are loaded, so these tests run offline."""
+    return EmergencyTriage()
+
+@pytest.mark.parametrize("query_text, expected_category", TRIAGE_CASES)
+def test_triage_category(triage_instance, query_text, expected_category):
+    result = triage_instance.classify(query_text)
+    if expected_category is None:
+        assert result is None, f"Query should not be triaged as an emergency: '{query_text}'"
+    else:
+        assert result is not None, f"Query should be triaged as '{expected_category}': '{query_text}'"
+        assert result["category"] == expected_category
+        assert result["matched_by"] == "pattern"
+
+def test_triage_preambles_are_source_cited(triage_instance):
+    preambles = [(p["category"], p[key]) for p in triage_instance.protocols for key in ("preamble", "diabetes_preamble")]
+    for category, preamble in preambles:
+        assert "Call emergency services immediately" in preamble
+        citations = preamble.split("Source Citations:")[-1]
+        cited = [line.split("Local Snippet: ", 1)[1].strip('"') for line in citations.strip().splitlines()]
+        assert cited, f"Preamble for '{category}' must cite at least one snippet."
+        assert all(snippet in MEDICAL_SNIPPETS for snippet in cited)
+
+def test_glucagon_only_for_diabetic_unconsciousness(triage_instance):
+    diabetic = triage_instance.classify("My diabetic father just became unconscious; we think his sugar crashed.")
+    non_diabetic = triage_instance.classify("My husband passed out at dinner")
+    assert diabetic["category"] == non_diabetic["category"] == "Unconsciousness"
+    assert "glucagon" in diabetic["preamble"]
+    assert "glucagon" not in non_diabetic["preamble"]
+    assert "CPR" in non_diabetic["preamble"]
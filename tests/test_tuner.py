@@ -0,0 +1,65 @@
+# tests/test_tuner.py
+import pytest
+from retrieval.tuner import timed, retrieval_recall, pareto_frontier, recommend
+
+def make_result(name, recall, latency, prompt_tokens):
+    return {"name": name, "recall": recall, "latency": latency, "prompt_tokens": prompt_tokens}
+
+def test_recall_counts_condition_and_each_keyword():
+    context = [{"content": "Hypoglycaemia needs rapid glucose intake.", "source": "local"}]
+    expected = {"condition": "Hypoglycaemia", "keywords": ["glucose", "carbohydrate"]}
+    assert retrieval_recall(context, expected) == pytest.approx(2 / 3)
+
+def test_recall_condition_list_counts_once():
+    context = [{"content": "Hyperkalemia and hyperkalaemia both mean high potassium.", "source": "local"}]
+    expected = {"condition": ["Hyperkalaemia", "Hyperkalemia"], "keywords": ["calcium gluconate"]}
+    # Both alternatives match, but the condition is still a single item
+    assert retrieval_recall(context, expected) == pytest.approx(1 / 2)
+
+def test_recall_matches_web_titles_case_insensitively():
+    context = [{"content": "First aid steps.", "title": "AKI Guide", "source": "web"}]
+    assert retrieval_recall(context, {"condition": "aki"}) == 1.0
+
+def test_recall_without_labels_is_zero():
+    assert retrieval_recall([{"content": "anything", "source": "local"}], {}) == 0.0
+
+def test_frontier_drops_dominated_configs():
+    a = make_result("a", 0.9, 1.0, 500)
+    b = make_result("b", 0.8, 1.2, 600) # Worse than a on every axis
+    c = make_result("c", 0.7, 0.5, 300) # Faster and smaller than a, so not dominated
+    frontier = pareto_frontier([a, b, c])
+    assert [r["name"] for r in frontier] == ["a", "c"]
+
+def test_frontier_keeps_exact_ties():
+    a = make_result("a", 0.9, 1.0, 500)
+    b = make_result("b", 0.9, 1.0, 500)
+    assert {r["name"] for r in pareto_frontier([a, b])} == {"a", "b"}
+
+def test_frontier_tie_on_two_axes_is_dominated_by_third():
+    a = make_result("a", 0.9, 1.0, 500)
+    b = make_result("b", 0.9, 1.0, 600)
+    assert [r["name"] for r in pareto_frontier([a, b])] == ["a"]
+
+def test_recommend_picks_fastest_within_tolerance():
+    frontier = [
+        make_result("best", 0.90, 2.0, 900),
+        make_result("close", 0.89, 1.0, 700),
+        make_result("fast", 0.80, 0.2, 200),
+    ]
+    assert recommend(frontier, recall_tolerance=0.02)["name"] == "close"
+    assert recommend(frontier, recall_tolerance=0.0)["name"] == "best"
+    assert recommend(frontier, recall_tolerance=0.2)["name"] == "fast"
+
+def test_recommend_breaks_latency_ties_on_prompt_tokens():
+    frontier = [make_result("big", 0.9, 1.0, 800), make_result("small", 0.9, 1.0, 400)]
+    assert recommend(frontier)["name"] == "small"
+
+def test_recommend_empty_frontier():
+    assert recommend([]) is None
+
+def test_timed_averages_over_repeats():
+    calls = []
+    result, latency = timed(lambda: calls.append(1) or len(calls), repeats=4)
+    assert len(calls) == 4
+    assert result == 4
+    assert latency >= 0.0
@@ -20,6 +20,27 @@ LLM_MODEL_NAME = "llama3-8b-8192" # Recommended for balance of speed and quality
 LOCAL_K = 10  # Number of snippets to retrieve from local corpus
 WEB_K = 5     # Number of snippets to retrieve from web search
 FINAL_CONTEXT_N = 8 # Number of top snippets to pass to LLM after re-ranking
+FAISS_INDEX_TYPE = "flat" # "flat" (exact L2) or "hnsw" (approximate, HNSW graph)
+HNSW_M = 32 # Neighbours per node when FAISS_INDEX_TYPE is "hnsw"
+
+# Speculative generation: start the LLM on local-only context while web search is in flight
+SPECULATIVE_GENERATION = False
+
+# Emergency triage: flag life-threatening presentations before the RAG pipeline runs
+TRIAGE_ENABLED = True
+TRIAGE_USE_CLASSIFIER = False # Also run the nearest-centroid classifier on the query embedding
+TRIAGE_CENTROID_THRESHOLD = 0.6 # Minimum cosine similarity to an emergency centroid
+
+# API Quotas (used by the bulk runner's rate limiters; override in .env to match your plan)
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))
+GOOGLE_CSE_DAILY_QUOTA = int(os.getenv("GOOGLE_CSE_DAILY_QUOTA", "100")) # Free tier: 100 queries/day
+GOOGLE_CSE_REQUESTS_PER_MINUTE = int(os.getenv("GOOGLE_CSE_REQUESTS_PER_MINUTE", "100"))
+GROQ_TOKENS_PER_REQUEST_ESTIMATE = 1200 # Reserved per call before the real usage.total_tokens is known
+BULK_MAX_WORKERS = 4 # Max concurrent queries in the bulk runner
+GROQ_MAX_RETRIES = 3 # Retries per query for Groq rate-limit and transient errors in the bulk runner
+GROQ_RETRY_BACKOFF = 2.0 # Seconds before the first retry (doubled each time) when Groq sends no Retry-After
+GROQ_MAX_RETRY_WAIT = 60 # A longer Retry-After means a daily limit; stop the run instead of sleeping
 
 # Disclaimer
 DISCLAIMER = (
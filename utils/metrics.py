@@ -7,6 +7,12 @@ class MetricsTracker:
         self.latency = 0.0
         self.token_usage = 0
         self.query_count = 0
+        self.speculation_attempts = 0
+        self.speculation_hits = 0
+        self.speculation_latency_saved = 0.0
+        self.triage_latency = 0.0
+        self.triage_count = 0
+        self.triage_matches = 0
 
     def start_timer(self):
         self.start_time = time.perf_counter()
@@ -16,12 +22,37 @@ class MetricsTracker:
             self.latency += (time.perf_counter() - self.start_time)
             del self.start_time
 
+    def add_latency(self, seconds: float):
+        self.latency += seconds
+
     def add_token_usage(self, tokens: int):
         self.token_usage += tokens
 
     def increment_query_count(self):
         self.query_count += 1
 
+    def record_speculation(self, hit: bool, latency_saved: float = 0.0):
+        self.speculation_attempts += 1
+        if hit:
+            self.speculation_hits += 1
+            self.speculation_latency_saved += latency_saved
+
+    def get_speculation_hit_rate(self):
+        if self.speculation_attempts == 0:
+            return 0
+        return self.speculation_hits / self.speculation_attempts
+
+    def add_triage(self, seconds: float, matched: bool):
+        self.triage_latency += seconds
+        self.triage_count += 1
+        if matched:
+            self.triage_matches += 1
+
+    def get_average_triage_latency(self):
+        if self.triage_count == 0:
+            return 0
+        return self.triage_latency / self.triage_count
+
     def get_average_latency(self):
         if self.query_count == 0:
             return 0
@@ -34,11 +65,29 @@ class MetricsTracker:
         self.latency = 0.0
         self.token_usage = 0
         self.query_count = 0
+        self.speculation_attempts = 0
+        self.speculation_hits = 0
+        self.speculation_latency_saved = 0.0
+        self.triage_latency = 0.0
+        self.triage_count = 0
+        self.triage_matches = 0
 
     def __str__(self):
-        return (
+        summary = (
             f"Metrics Summary:\n"
             f"  Queries Processed: {self.query_count}\n"
             f"  Average Latency: {self.get_average_latency():.2f} seconds\n"
             f"  Total Token Usage: {self.get_total_token_usage()} tokens"
-        )
\ No newline at end of file
+        )
+        if self.speculation_attempts:
+            summary += (
+                f"\n  Speculation Hit Rate: {self.get_speculation_hit_rate():.0%} "
+                f"({self.speculation_hits}/{self.speculation_attempts})\n"
+                f"  Latency Saved by Speculation: {self.speculation_latency_saved:.2f} seconds"
+            )
+        if self.triage_count:
+            summary += (
+                f"\n  Emergency Triage Matches: {self.triage_matches}/{self.triage_count}\n"
+                f"  Average Triage Latency: {self.get_average_triage_latency() * 1000:.2f} ms"
+            )
+        return summary
\ No newline at end of file
@@ -0,0 +1,119 @@
+# utils/rate_limiter.py
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+class QuotaExceededError(RuntimeError):
+    """Raised when a hard API quota has been used up and further calls must wait for the next reset."""
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket limiter.
+    `capacity` tokens are available up front and refill continuously at `refill_rate` tokens per second.
+    """
+    def __init__(self, capacity: float, refill_rate: float):
+        if capacity <= 0 or refill_rate <= 0:
+            raise ValueError("TokenBucket capacity and refill_rate must be positive.")
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float, burst_fraction: float = 0.25):
+        """
+        Bucket that admits at most `limit` tokens in any 60 s window.
+        A full bucket plus a minute of refill must not exceed the limit, so the burst
+        capacity is `burst_fraction` of it and only the remainder refills over the minute.
+        """
+        capacity = limit * burst_fraction
+        return cls(capacity=capacity, refill_rate=(limit - capacity) / 60.0)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def acquire(self, amount: float = 1.0):
+        """Blocks until `amount` tokens are available, then consumes them."""
+        # Never ask for more than the bucket can hold, otherwise we would wait forever
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.refill_rate
+            time.sleep(wait)
+
+    def adjust(self, delta: float):
+        """
+        Corrects an earlier reservation once the real cost is known.
+        A positive delta consumes extra tokens (the balance may go negative, delaying later callers),
+        a negative delta refunds unused tokens.
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+class DailyQuota:
+    """
+    Hard cap on calls per day, persisted to `state_path` so restarts do not get a fresh allowance.
+    The day rolls over at midnight in `timezone` (Google API quotas reset at midnight Pacific Time).
+    """
+    def __init__(self, limit: int, state_path: str, timezone: str = "America/Los_Angeles"):
+        self.limit = limit
+        self.state_path = state_path
+        self.timezone = ZoneInfo(timezone)
+        self.lock = threading.Lock()
+        self.day, self.used = self._load()
+
+    def _today(self) -> str:
+        return datetime.now(self.timezone).date().isoformat()
+
+    def _load(self) -> tuple[str, int]:
+        today = self._today()
+        if not os.path.exists(self.state_path):
+            return today, 0
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("day") != today:
+            return today, 0
+        return today, int(state.get("used", 0))
+
+    def _save(self):
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"day": self.day, "used": self.used}, f)
+
+    def try_acquire(self) -> bool:
+        """Records one call and returns True, or returns False if today's quota is used up."""
+        with self.lock:
+            today = self._today()
+            if today != self.day:
+                self.day, self.used = today, 0
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            # Persist before the call is made, so a crash can only over-count, never under-count
+            self._save()
+            return True
+
+    def remaining(self) -> int:
+        with self.lock:
+            if self._today() != self.day:
+                return self.limit
+            return max(self.limit - self.used, 0)
+
+if __name__ == "__main__":
+    # Example usage: 5 requests per second, burst of 2
+    bucket = TokenBucket(capacity=2, refill_rate=5)
+    start = time.perf_counter()
+    for i in range(6):
+        bucket.acquire()
+        print(f"Request {i+1} admitted at {time.perf_counter() - start:.2f}s")